@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import List, Optional
+
 import numpy as np
 
 
@@ -9,16 +11,29 @@ class Space:
     def sample(self):  # pragma: no cover - compatibility shim
         raise NotImplementedError
 
+    def seed(self, seed: Optional[int] = None) -> List[Optional[int]]:  # pragma: no cover - compatibility shim
+        return [seed]
+
 
 class Box(Space):
-    def __init__(self, low, high, shape, dtype=float):
+    def __init__(self, low, high, shape, dtype=float, seed: Optional[int] = None):
         self.low = np.broadcast_to(np.asarray(low, dtype=dtype), shape)
         self.high = np.broadcast_to(np.asarray(high, dtype=dtype), shape)
         self.shape = shape
         self.dtype = dtype
+        self._range = np.asarray(self.high - self.low, dtype=dtype)
+        self.seed(seed)
+
+    def seed(self, seed: Optional[int] = None) -> List[Optional[int]]:
+        # Unseeded spaces draw their generator's seed from the global NumPy state on the first
+        # sample, so np.random.seed() called after construction keeps sampling reproducible.
+        self._rng = None if seed is None else np.random.default_rng(seed)
+        return [seed]
 
     def sample(self) -> np.ndarray:
-        return np.random.uniform(self.low, self.high).astype(self.dtype)
+        if self._rng is None:
+            self._rng = np.random.default_rng(np.random.randint(0, 2**32, dtype=np.uint64))
+        return (self._rng.random(self.shape) * self._range + self.low).astype(self.dtype, copy=False)
 
 
 __all__ = ["Space", "Box"]
@@ -10,24 +10,48 @@ problems followed from that approach:
   to trigger circular import issues when those modules relied on absolute
   ``marketsim.`` imports.
 
-To keep ``import marketsim`` lightweight and robust we only perform the
-relatively small re-exports that are guaranteed to exist.  The sampled arrival
+To keep ``import marketsim`` lightweight and robust we only re-export names
+that are guaranteed to exist, and resolve them lazily (PEP 562): the
+submodule defining a name is imported on first attribute access, so the
+package itself does not pull in NumPy or Torch.  The sampled arrival
 simulator remains available from ``marketsim.simulator``.
 """
 
-from .simulator.simulator import Simulator
-from .market.market import Market
-from .fourheap.fourheap import FourHeap
-from .fourheap.order_queue import OrderQueue
-from .experiment import Config, Experiment
+import importlib
 
 __version__ = "0.1.0"
 
+_LAZY = {
+    "Simulator": "marketsim.simulator.simulator",
+    "Market": "marketsim.market.market",
+    "FourHeap": "marketsim.fourheap.fourheap",
+    "OrderQueue": "marketsim.fourheap.order_queue",
+    "Experiment": "marketsim.experiment",
+    "ExperimentBatch": "marketsim.experiment",
+    "Config": "marketsim.experiment",
+}
+
 __all__ = [
     "Simulator",
     "Market",
     "FourHeap",
     "OrderQueue",
     "Experiment",
+    "ExperimentBatch",
     "Config",
 ]
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), name)
+    # Cache on the package so later lookups bypass __getattr__.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import dataclasses
 import math
 import random
+import sys
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional, Sequence, Type
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
 
 from .fourheap import constants
 from .fourheap.order import MatchedOrder
@@ -15,13 +19,33 @@ from .simulator.simulator import Simulator
 
 
 TradeCallback = Callable[["TradeEvent"], None]
+TradeBatchCallback = Callable[[List["TradeEvent"]], None]
 TopOfBookCallback = Callable[["TopOfBookEvent"], None]
 
+_SIDE_MAP = {constants.BUY: "BUY", constants.SELL: "SELL"}
+_TOP_OF_BOOK_COLUMNS = ("time", "best_bid", "bid_size", "best_ask", "ask_size")
 
-@dataclass
+
+def _frozen_slots_getstate(self) -> Tuple[Any, ...]:
+    return tuple(getattr(self, name) for name in self.__slots__)
+
+
+def _frozen_slots_setstate(self, state: Tuple[Any, ...]) -> None:
+    # The frozen ``__setattr__`` would reject the default slot restore used by pickle/copy.
+    for name, value in zip(self.__slots__, state):
+        object.__setattr__(self, name, value)
+
+
+@dataclass(frozen=True)
 class TradeEvent:
     """Normalized trade information emitted by an :class:`Exchange`."""
 
+    # Declared by hand rather than via ``slots=True`` to keep Python 3.8 support, so the
+    # pickle/copy state hooks that ``slots=True`` would generate are supplied explicitly.
+    __slots__ = ("price", "qty", "side", "time", "agent_id")
+    __getstate__ = _frozen_slots_getstate
+    __setstate__ = _frozen_slots_setstate
+
     price: float
     qty: float
     side: str
@@ -29,10 +53,14 @@ class TradeEvent:
     agent_id: int
 
 
-@dataclass
+@dataclass(frozen=True)
 class TopOfBookEvent:
     """Snapshot of the current best bid and ask state."""
 
+    __slots__ = ("best_bid", "bid_size", "best_ask", "ask_size", "time")
+    __getstate__ = _frozen_slots_getstate
+    __setstate__ = _frozen_slots_setstate
+
     best_bid: Optional[float]
     bid_size: float
     best_ask: Optional[float]
@@ -46,8 +74,21 @@ class Exchange:
     def __init__(self, name: str = "market-0") -> None:
         self.name = name
         self._market: Optional[Market] = None
-        self._trade_handlers: List[TradeCallback] = []
-        self._top_handlers: List[TopOfBookCallback] = []
+        # Handlers are kept in tuples that are replaced on subscription, so dispatch can
+        # iterate them directly without copying even if a handler subscribes another one.
+        self._trade_handlers: Tuple[TradeCallback, ...] = ()
+        self._trade_batch_handlers: Tuple[TradeBatchCallback, ...] = ()
+        self._top_handlers: Tuple[TopOfBookCallback, ...] = ()
+        # ``stream=False`` handlers, each paired with the first log row it should receive.
+        self._deferred_top_handlers: Tuple[Tuple[TopOfBookCallback, int], ...] = ()
+        self._batching = False
+        self._pending_trades: List[TradeEvent] = []
+
+        # Columnar top-of-book log, one row per snapshot (see ``_TOP_OF_BOOK_COLUMNS``).
+        self._recording = False
+        self._top_rows = np.empty((0, len(_TOP_OF_BOOK_COLUMNS)), dtype=np.float64)
+        self._top_count = 0
+        self._top_flushed = 0
 
     def bind_market(self, market: Market) -> None:
         """Attach the underlying :class:`Market` so book snapshots can be emitted."""
@@ -56,56 +97,171 @@ class Exchange:
 
     # Subscription helpers -----------------------------------------------------------------
     def on_trade(self, callback: TradeCallback) -> TradeCallback:
-        self._trade_handlers.append(callback)
+        self._trade_handlers = self._trade_handlers + (callback,)
         return callback
 
-    def on_top_of_book(self, callback: TopOfBookCallback) -> TopOfBookCallback:
-        self._top_handlers.append(callback)
+    def on_trades_batch(self, callback: TradeBatchCallback) -> TradeBatchCallback:
+        """Receive trades as a list, once per batch (or per trade outside a batch)."""
+
+        self._trade_batch_handlers = self._trade_batch_handlers + (callback,)
+        return callback
+
+    def on_top_of_book(self, callback: TopOfBookCallback, *, stream: bool = True) -> TopOfBookCallback:
+        """Subscribe to top-of-book snapshots.
+
+        With ``stream=False`` snapshots are only written to the columnar log; the callback
+        receives the ones recorded after it subscribed, materialized as events, when
+        :meth:`flush_top_of_book` is called. Subscribing never flushes other handlers.
+        """
+
+        if stream:
+            self._top_handlers = self._top_handlers + (callback,)
+        else:
+            self.record_top_of_book()
+            self._deferred_top_handlers = self._deferred_top_handlers + ((callback, self._top_count),)
         return callback
 
+    # Columnar top-of-book log -------------------------------------------------------------
+    def record_top_of_book(self, capacity: int = 1024) -> None:
+        """Log every snapshot into preallocated NumPy columns (see :meth:`top_of_book_frame`)."""
+
+        self._recording = True
+        if len(self._top_rows) < capacity:
+            self._reserve_top_rows(capacity)
+
+    def top_of_book_frame(self) -> Dict[str, np.ndarray]:
+        """Return the recorded snapshots column-wise; missing quotes are ``nan``."""
+
+        rows = self._top_rows[: self._top_count]
+        frame = {name: rows[:, idx].copy() for idx, name in enumerate(_TOP_OF_BOOK_COLUMNS)}
+        frame["time"] = frame["time"].astype(np.int64)
+        return frame
+
+    def _reserve_top_rows(self, capacity: int) -> None:
+        rows = np.empty((capacity, len(_TOP_OF_BOOK_COLUMNS)), dtype=np.float64)
+        rows[: self._top_count] = self._top_rows[: self._top_count]
+        self._top_rows = rows
+
+    def flush_top_of_book(self) -> None:
+        """Deliver snapshots recorded since the last flush to the ``stream=False`` handlers."""
+
+        start = self._top_flushed
+        self._top_flushed = self._top_count
+        if not self._deferred_top_handlers:
+            return
+        # Rows before the earliest subscription are never delivered, so skip materializing them.
+        start = max(start, min(first_row for _, first_row in self._deferred_top_handlers))
+        if start >= self._top_count:
+            return
+        rows = self._top_rows[start : self._top_count].tolist()
+        events = [
+            TopOfBookEvent(
+                best_bid=None if math.isnan(best_bid) else best_bid,
+                bid_size=bid_size,
+                best_ask=None if math.isnan(best_ask) else best_ask,
+                ask_size=ask_size,
+                time=int(time),
+            )
+            for time, best_bid, bid_size, best_ask, ask_size in rows
+        ]
+        for handler, first_row in self._deferred_top_handlers:
+            for event in events[max(first_row - start, 0):]:
+                handler(event)
+
+    # Batching -----------------------------------------------------------------------------
+    def begin_batch(self) -> None:
+        """Buffer trades until :meth:`end_batch` instead of dispatching them one by one."""
+
+        self._batching = True
+
+    def end_batch(self) -> None:
+        """Flush buffered trades to their handlers."""
+
+        self._batching = False
+        if not self._pending_trades:
+            return
+
+        events = self._pending_trades
+        self._pending_trades = []
+        for handler in self._trade_handlers:
+            for event in events:
+                handler(event)
+        for batch_handler in self._trade_batch_handlers:
+            batch_handler(events)
+
     # Hooks used by the simulators ----------------------------------------------------------
     def handle_trade(self, matched_order: MatchedOrder) -> None:
-        if not self._trade_handlers:
+        if not self._trade_handlers and not self._trade_batch_handlers:
             return
 
-        side = "BUY" if matched_order.order.order_type == constants.BUY else "SELL"
+        order = matched_order.order
         event = TradeEvent(
             price=matched_order.price,
-            qty=float(matched_order.order.quantity),
-            side=side,
+            qty=float(order.quantity),
+            side=_SIDE_MAP[order.order_type],
             time=matched_order.time,
-            agent_id=matched_order.order.agent_id,
+            agent_id=order.agent_id,
         )
-        for handler in list(self._trade_handlers):
+        if self._batching:
+            self._pending_trades.append(event)
+            return
+
+        for handler in self._trade_handlers:
             handler(event)
+        if self._trade_batch_handlers:
+            events = [event]
+            for batch_handler in self._trade_batch_handlers:
+                batch_handler(events)
 
     def handle_top_of_book(self, market: Market) -> None:
-        if not self._top_handlers:
+        if not self._top_handlers and not self._recording:
             return
 
         # Ensure we keep a reference to the latest market instance.
         if self._market is None:
             self._market = market
 
-        book = market.order_book
-        bid_order = book.buy_unmatched.peek_order()
-        ask_order = book.sell_unmatched.peek_order()
+        best_bid, bid_size, best_ask, ask_size = market.order_book.top_of_book()
+        time = market.get_time()
+
+        if self._recording:
+            if self._top_count == len(self._top_rows):
+                self._reserve_top_rows(max(2 * self._top_count, 1024))
+            self._top_rows[self._top_count] = (
+                time,
+                math.nan if best_bid is None else best_bid,
+                bid_size,
+                math.nan if best_ask is None else best_ask,
+                ask_size,
+            )
+            self._top_count += 1
 
+        if not self._top_handlers:
+            return
         event = TopOfBookEvent(
-            best_bid=self._finite_or_none(book.get_best_bid()),
-            bid_size=float(bid_order.quantity) if bid_order is not None else 0.0,
-            best_ask=self._finite_or_none(book.get_best_ask()),
-            ask_size=float(ask_order.quantity) if ask_order is not None else 0.0,
-            time=market.get_time(),
+            best_bid=best_bid,
+            bid_size=bid_size,
+            best_ask=best_ask,
+            ask_size=ask_size,
+            time=time,
         )
-        for handler in list(self._top_handlers):
+        for handler in self._top_handlers:
             handler(event)
 
-    @staticmethod
-    def _finite_or_none(value: float) -> Optional[float]:
-        if math.isinf(value):
-            return None
-        return value
+
+def _seed_global_rngs(seed: int) -> None:
+    """Seed the process-wide ``random``, NumPy and (if loaded) Torch generators.
+
+    Torch is only seeded when something has already imported it, so seeding never pays
+    for a cold ``import torch``.  Components that own a generator (e.g. the sampled
+    arrival simulator) should receive the seed directly instead.
+    """
+
+    random.seed(seed)
+    np.random.seed(seed)
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.manual_seed(seed)
 
 
 @dataclass
@@ -167,9 +323,18 @@ class Config:
         return cls(simulator_cls=simulator_cls, simulator_kwargs=simulator_kwargs, seed=seed)
 
     def build_simulator(self, *, market_observers: Optional[Sequence[object]] = None) -> Any:
-        kwargs = dict(self.simulator_kwargs)
-        if market_observers is not None:
-            kwargs["market_observers"] = market_observers
+        """Instantiate ``simulator_cls`` from ``simulator_kwargs``.
+
+        The kwargs are unpacked into a fresh dict by the call itself, so they are only
+        copied explicitly when observers have to be added. Simulators must not mutate
+        ``simulator_kwargs``; configs are shared across runs (see :class:`ExperimentBatch`).
+        """
+
+        kwargs = (
+            self.simulator_kwargs
+            if market_observers is None
+            else {**self.simulator_kwargs, "market_observers": market_observers}
+        )
         return self.simulator_cls(**kwargs)
 
 
@@ -193,43 +358,36 @@ class Experiment:
     def __init__(self, config: Config):
         self.config = config
         self.simulator = self._build_simulator()
-        self.exchange: Exchange = self._exchanges[0]
         self._trade_count = 0
-        self.exchange.on_trade(self._record_trade)
+        # Count per flushed batch rather than per trade (one increment per simulator step).
+        self.exchange.on_trades_batch(self._record_trades)
 
-    def _build_simulator(self) -> Any:
+    def _seed_rngs(self) -> None:
         if self.config.seed is not None:
-            random.seed(self.config.seed)
-            try:
-                import numpy as np
+            _seed_global_rngs(self.config.seed)
 
-                np.random.seed(self.config.seed)
-            except Exception:
-                pass
-            try:
-                import torch
-
-                torch.manual_seed(self.config.seed)
-            except Exception:
-                pass
-
-        self._exchanges: List[Exchange] = []
-        market_observers: List[Exchange] = []
+    def _build_simulator(self) -> Any:
+        self._seed_rngs()
 
         # Prepare one exchange per market to keep the interface uniform.
         num_markets = self.config.simulator_kwargs.get("num_assets", 1)
-        for idx in range(num_markets):
-            exchange = Exchange(name=f"market-{idx}")
-            self._exchanges.append(exchange)
-            market_observers.append(exchange)
-
-        simulator = self.config.build_simulator(market_observers=market_observers)
-        for idx, exchange in enumerate(self._exchanges[: len(simulator.markets)]):
-            exchange.bind_market(simulator.markets[idx])
+        if num_markets == 1:
+            # Common case: a single exchange observer, no per-market loops or lookups.
+            exchange = Exchange(name="market-0")
+            self._exchanges: List[Exchange] = [exchange]
+            simulator = self.config.build_simulator(market_observers=(exchange,))
+            if simulator.markets:
+                exchange.bind_market(simulator.markets[0])
+            return simulator
+
+        self._exchanges = [Exchange(name=f"market-{idx}") for idx in range(num_markets)]
+        simulator = self.config.build_simulator(market_observers=self._exchanges)
+        for exchange, market in zip(self._exchanges, simulator.markets):
+            exchange.bind_market(market)
         return simulator
 
-    def _record_trade(self, _: TradeEvent) -> None:
-        self._trade_count += 1
+    def _record_trades(self, events: List[TradeEvent]) -> None:
+        self._trade_count += len(events)
 
     def run(self) -> RunResult:
         self._trade_count = 0
@@ -248,3 +406,65 @@ class Experiment:
     @exchange.setter
     def exchange(self, value: Exchange) -> None:
         self._exchanges[0] = value
+
+
+@dataclass
+class BatchResult:
+    """Column-oriented results of an :class:`ExperimentBatch` sweep.
+
+    Each array has one entry per configuration, in the order the batch was built.
+    Missing fundamentals are stored as ``nan``.
+    """
+
+    steps: np.ndarray
+    trades: np.ndarray
+    final_fundamental: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def summary(self) -> Dict[str, np.ndarray]:
+        return {
+            "steps": self.steps,
+            "trades": self.trades,
+            "final_fundamental": self.final_fundamental,
+        }
+
+
+class ExperimentBatch:
+    """Run a sweep of experiments (e.g. seeds x market configs) as a single unit.
+
+    Every configuration is built and run in turn so that global seeding performed by
+    :class:`Experiment` stays reproducible per run, while the results are written into
+    preallocated arrays instead of a list of :class:`RunResult` objects.
+    """
+
+    def __init__(self, configs: Sequence[Config]):
+        self.configs: List[Config] = list(configs)
+
+    @classmethod
+    def from_seeds(cls, config: Config, seeds: Iterable[int]) -> "ExperimentBatch":
+        """Replicate ``config`` once per seed, each replica with its own copy of ``simulator_kwargs``."""
+
+        return cls([
+            dataclasses.replace(config, simulator_kwargs=dict(config.simulator_kwargs), seed=seed)
+            for seed in seeds
+        ])
+
+    def __len__(self) -> int:
+        return len(self.configs)
+
+    def run(self) -> BatchResult:
+        size = len(self.configs)
+        steps = np.zeros(size, dtype=np.int64)
+        trades = np.zeros(size, dtype=np.int64)
+        final_fundamental = np.full(size, np.nan, dtype=np.float64)
+
+        for idx, config in enumerate(self.configs):
+            result = Experiment(config).run()
+            steps[idx] = result.steps
+            trades[idx] = result.trades
+            if result.final_fundamental is not None:
+                final_fundamental[idx] = float(result.final_fundamental)
+
+        return BatchResult(steps=steps, trades=trades, final_fundamental=final_fundamental)
@@ -1,4 +1,5 @@
 from collections import defaultdict
+from typing import Optional, Tuple
 from marketsim.fourheap import constants
 from marketsim.fourheap.order import Order
 from marketsim.fourheap.order_queue import OrderQueue
@@ -157,6 +158,25 @@ class FourHeap:
     def get_best_ask(self) -> float:
         return self.sell_unmatched.peek()
 
+    def top_of_book(self) -> Tuple[Optional[float], float, Optional[float], float]:
+        """
+        Return ``(best_bid, bid_size, best_ask, ask_size)`` read from the top of each unmatched queue in one pass.
+        Missing quotes are ``None`` with size ``0.0``.
+        """
+        bid_order = self.buy_unmatched.peek_order()
+        ask_order = self.sell_unmatched.peek_order()
+        if bid_order is None:
+            best_bid, bid_size = None, 0.0
+        else:
+            best_bid = bid_order.price if math.isfinite(bid_order.price) else None
+            bid_size = float(bid_order.quantity)
+        if ask_order is None:
+            best_ask, ask_size = None, 0.0
+        else:
+            best_ask = ask_order.price if math.isfinite(ask_order.price) else None
+            ask_size = float(ask_order.quantity)
+        return best_bid, bid_size, best_ask, ask_size
+
     def update_midprice(self, lookback=14):
         best_ask = self.get_best_ask()
         best_bid = self.get_best_bid()
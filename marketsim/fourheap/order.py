@@ -1,7 +1,13 @@
+import sys
 from dataclasses import dataclass
 
+# Orders are created on every arrival and compared constantly inside the heaps, so they are
+# slotted. ``dataclass(slots=True)`` needs Python 3.10; ``Order.asset_id`` has a default,
+# which rules out declaring ``__slots__`` by hand, so older interpreters keep a ``__dict__``.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class Order:
     price: float
     order_type: int  # -1 for a sell order, +1 for a buy order
@@ -44,7 +50,7 @@ class Order:
             return self.price > other.price
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class MatchedOrder:
     price: float
     time: int
@@ -1,10 +1,20 @@
 import heapq
 import math
+from itertools import count
 from typing import Optional
+
 from marketsim.fourheap.order import Order, MatchedOrder
 
 
 class OrderQueue:
+    """
+    Priority queue of resting orders with price-time priority.
+
+    ``heap`` holds ``(price, time, seq, order_id)`` entries (price negated for max heaps), so the best order is
+    always ``heap[0]`` and orders at the same price leave in arrival order. Prices are compared as exact floats.
+    ``_entries`` maps a live order id to its heap entry; removed orders are left in the heap and dropped lazily
+    once they reach the top, and the heap is rebuilt from the live entries when stale ones outnumber them.
+    """
     def __init__(self, is_max_heap=False, is_matched=False):
         self.is_max_heap = is_max_heap
         self.is_matched = is_matched
@@ -12,144 +22,92 @@ class OrderQueue:
         self.size = 0
         self.heap = []
         self.order_dict = {}
-        self.deleted_ids = set()
+        self._entries = {}
+        self._sign = -1 if is_max_heap else 1
+        self._seq = count()
+
+    def _drop_removed(self):
+        heap = self.heap
+        entries = self._entries
+        if len(heap) > 2*len(entries) + 32:
+            heap = self.heap = list(entries.values())
+            heapq.heapify(heap)
+            return
+        while heap and entries.get(heap[0][3]) is not heap[0]:
+            heapq.heappop(heap)
 
     def add_order(self, order: Order):
-        price = order.price if not self.is_max_heap else -order.price
         order_id = order.order_id
         if self.contains(order_id):
             self.order_dict[order_id].merge_order(order.quantity)
         else:
-            heapq.heappush(self.heap, (price, order.order_id))
-            self.order_dict[order.order_id] = order
+            entry = (self._sign*order.price, order.time, next(self._seq), order_id)
+            heapq.heappush(self.heap, entry)
+            self._entries[order_id] = entry
+            self.order_dict[order_id] = order
         self.size += order.quantity
 
-    # def peek(self) -> float:
-    #     c = -1 if self.is_max_heap else 1
-    #
-    #     if self.is_empty():
-    #         return c*math.inf
-    #
-    #     return c*self.heap[0][0]
-    #
-    # def peek_order(self) -> Order:
-    #     if self.is_empty():
-    #         # return None
-    #         return Order(price=0, agent_id=0, order_id=0, order_type=0, quantity=0, time=0)
-    #     order_id = self.heap[0][1]
-    #     return self.order_dict[order_id]
-
     def peek(self) -> float:
         c = -1 if self.is_max_heap else 1
         # Return infinity if empty
-        if self.is_empty() or len(self.heap) == 0:
-            return c*math.inf
-        
-        # Clean up deleted orders
-        try:
-            while len(self.heap) > 0 and self.heap[0][1] in self.deleted_ids:
-                heapq.heappop(self.heap)
-                if len(self.heap) == 0:
-                    return c*math.inf
-        except IndexError:
-            return c*math.inf
-        
-        # If we get here, heap should have at least one valid element
-        if len(self.heap) == 0:
+        if self.is_empty():
             return c*math.inf
-        
-        return c*self.heap[0][0]
+        return self.order_dict[self.heap[0][3]].price
 
-    def peek_order(self) -> Order:
-        if self.is_empty() or len(self.heap) == 0:
-            return None
-        # Safely clean up deleted orders
-        try:
-            while len(self.heap) > 0 and self.heap[0][1] in self.deleted_ids:
-                heapq.heappop(self.heap)
-            # Check if heap is now empty
-            if len(self.heap) == 0:
-                return None
-            order_id = self.heap[0][1]
-            return self.order_dict[order_id]
-        except (IndexError, KeyError):
+    def peek_order(self) -> Optional[Order]:
+        if self.is_empty():
             return None
+        return self.order_dict[self.heap[0][3]]
 
-    def peek_order_id(self) -> float:
-        if self.is_empty() or len(self.heap) == 0:
-            return None
-        try:
-            return self.heap[0][1]
-        except IndexError:
+    def peek_order_id(self) -> Optional[int]:
+        if self.is_empty():
             return None
+        return self.heap[0][3]
 
     def clear(self):
         self.heap = []
         self.order_dict = {}
-        self.deleted_ids = set()
+        self._entries = {}
         self.size = 0
 
     def market_clear(self, p, t):
         if self.is_matched:
-            matched_orders = []
-            for _, order_id in self.heap:
-                if order_id not in self.deleted_ids:
-                    order = self.order_dict[order_id]
-                    matched_orders.append(MatchedOrder(p, t, order))
+            matched_orders = [MatchedOrder(p, t, self.order_dict[order_id])
+                              for *_, order_id in sorted(self._entries.values())]
             self.clear()
             return matched_orders
         return None
 
     def is_empty(self) -> bool:
-        return self.size <= 0 or len(self.heap) == 0
+        return self.size <= 0 or not self.heap
 
     def count(self) -> int:
         return self.size
 
     def remove(self, order_id: int):
         if self.contains(order_id):
-            self.deleted_ids.add(order_id)
-            self.size -= self.order_dict[order_id].quantity
-            
-            # Clean up top of heap if needed
-            try:
-                # Only try to clean up if there are items in the heap
-                if len(self.heap) > 0:
-                    # Use direct access to heap instead of peek_order which could cause recursion
-                    while len(self.heap) > 0 and self.heap[0][1] in self.deleted_ids:
-                        heapq.heappop(self.heap)
-            except (KeyError, AttributeError, IndexError):
-                pass
-            
-            # Remove from order dict
-            del self.order_dict[order_id]
+            order = self.order_dict.pop(order_id)
+            del self._entries[order_id]
+            self.size -= order.quantity
+            self._drop_removed()
 
     def contains(self, order_id: int) -> bool:
         return order_id in self.order_dict
 
     def push_to(self) -> Optional['Order']:
-        while self.heap:
-            price, order_id = heapq.heappop(self.heap)
-            if order_id not in self.deleted_ids:
-                order = self.order_dict[order_id]
-                self.size -= order.quantity
-                del self.order_dict[order.order_id]
-
-                # Make sure the new top of heap is not a removed order
-                try:
-                    while len(self.heap) > 0 and self.heap[0][1] in self.deleted_ids:
-                        heapq.heappop(self.heap)
-                except IndexError:
-                    pass
-
-                return order
-        return None
+        self._drop_removed()
+        if not self.heap:
+            return None
+        _, _, _, order_id = heapq.heappop(self.heap)
+        del self._entries[order_id]
+        order = self.order_dict.pop(order_id)
+        self.size -= order.quantity
+        self._drop_removed()
+        return order
 
     def __str__(self):
         s = ''
-        for _, order_id in self.heap:
-            if order_id not in self.deleted_ids:
-                order = self.order_dict[order_id]
-                s += str(order) + '\n'
+        for *_, order_id in sorted(self._entries.values()):
+            s += str(self.order_dict[order_id]) + '\n'
 
         return s
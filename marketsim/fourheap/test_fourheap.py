@@ -0,0 +1,36 @@
+import pytest
+
+from marketsim.fourheap.fourheap import FourHeap
+from marketsim.fourheap.order import Order
+
+
+def test_top_of_book():
+    book = FourHeap()
+    assert book.top_of_book() == (None, 0.0, None, 0.0)
+
+    book.insert(Order(price=99.0, order_type=1, quantity=2, agent_id=1, time=1, order_id=1))
+    book.insert(Order(price=98.0, order_type=1, quantity=1, agent_id=2, time=1, order_id=2))
+    book.insert(Order(price=101.0, order_type=-1, quantity=3, agent_id=3, time=1, order_id=3))
+
+    assert book.top_of_book() == (99.0, 2.0, 101.0, 3.0)
+    best_bid, _, best_ask, _ = book.top_of_book()
+    assert best_bid == book.get_best_bid()
+    assert best_ask == book.get_best_ask()
+
+
+def test_market_clear_matches_best_exact_bid():
+    book = FourHeap()
+    book.insert(Order(price=100.00001, order_type=1, quantity=1, agent_id=1, time=1, order_id=1))
+    book.insert(Order(price=100.00004, order_type=1, quantity=1, agent_id=2, time=2, order_id=2))
+    book.insert(Order(price=100.00003, order_type=-1, quantity=1, agent_id=3, time=3, order_id=3))
+
+    assert book.get_best_bid() == 100.00001
+    matched = book.market_clear(3)
+    assert {m.order.order_id for m in matched} == {2, 3}
+    assert book.get_best_bid() == 100.00001
+    assert book.get_best_ask() == float('inf')
+
+
+# if you want to run this file directly, you can use the following command
+if __name__ == "__main__":
+    pytest.main()
@@ -52,6 +52,63 @@ def test_order_comparisons():
     assert not (sell_order2 > sell_order1)
 
 
+def test_order_queue_price_time_priority():
+    buy_queue = OrderQueue(is_max_heap=True)
+    buy_queue.add_order(Order(price=100.0, order_type=1, quantity=1, agent_id=1, time=1, order_id=1))
+    buy_queue.add_order(Order(price=101.0, order_type=1, quantity=1, agent_id=2, time=2, order_id=2))
+    buy_queue.add_order(Order(price=101.0, order_type=1, quantity=1, agent_id=3, time=3, order_id=3))
+    buy_queue.add_order(Order(price=99.0, order_type=1, quantity=1, agent_id=4, time=0, order_id=4))
+    assert [buy_queue.push_to().order_id for _ in range(4)] == [2, 3, 1, 4]
+    assert buy_queue.push_to() is None
+
+    sell_queue = OrderQueue(is_max_heap=False)
+    sell_queue.add_order(Order(price=101.0, order_type=-1, quantity=1, agent_id=1, time=1, order_id=1))
+    sell_queue.add_order(Order(price=100.0, order_type=-1, quantity=1, agent_id=2, time=3, order_id=2))
+    sell_queue.add_order(Order(price=100.0, order_type=-1, quantity=1, agent_id=3, time=2, order_id=3))
+    assert [sell_queue.push_to().order_id for _ in range(3)] == [3, 2, 1]
+
+
+def test_order_queue_ranks_on_exact_price():
+    buy_queue = OrderQueue(is_max_heap=True)
+    buy_queue.add_order(Order(price=100.00001, order_type=1, quantity=1, agent_id=1, time=1, order_id=1))
+    buy_queue.add_order(Order(price=100.00004, order_type=1, quantity=1, agent_id=2, time=2, order_id=2))
+    assert buy_queue.peek() == 100.00004
+    assert buy_queue.peek_order_id() == 2
+
+
+def test_order_queue_remove_non_head_order():
+    sell_queue = OrderQueue(is_max_heap=False)
+    for order_id, price in enumerate([100.0, 101.0, 102.0], start=1):
+        sell_queue.add_order(Order(price=price, order_type=-1, quantity=2, agent_id=order_id, time=order_id,
+                                   order_id=order_id))
+
+    sell_queue.remove(2)
+    assert not sell_queue.contains(2)
+    assert sell_queue.count() == 4
+    assert sell_queue.peek() == 100.0
+
+    sell_queue.remove(1)
+    assert sell_queue.peek() == 102.0
+    assert sell_queue.push_to().order_id == 3
+    assert sell_queue.is_empty()
+
+
+def test_order_queue_compacts_cancelled_orders():
+    buy_queue = OrderQueue(is_max_heap=True)
+    buy_queue.add_order(Order(price=50.0, order_type=1, quantity=1, agent_id=0, time=0, order_id=0))
+    for order_id in range(1, 201):
+        buy_queue.add_order(Order(price=100.0 + order_id, order_type=1, quantity=1, agent_id=order_id,
+                                  time=order_id, order_id=order_id))
+    for order_id in range(1, 200):
+        buy_queue.remove(order_id)
+
+    assert len(buy_queue.heap) < 100
+    assert buy_queue.count() == 2
+    assert buy_queue.peek() == 300.0
+    assert [buy_queue.push_to().order_id for _ in range(2)] == [200, 0]
+    assert buy_queue.is_empty()
+
+
 # if you want to run this file directly, you can use the following command
 if __name__ == "__main__":
     pytest.main()
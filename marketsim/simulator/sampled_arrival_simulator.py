@@ -1,13 +1,13 @@
 from collections import defaultdict
 from typing import Optional, Sequence
 
-import torch
-import torch.distributions as dist
+import numpy as np
 
 from ..market.market import Market
 from ..fundamental.lazy_mean_reverting import LazyGaussianMeanReverting
 from ..agent.zero_intelligence_agent import ZIAgent
 from ..agent.hbl_agent import HBLAgent
+from .simulator import begin_observer_batches, end_observer_batches, final_values
 class SimulatorSampledArrival:
     def __init__(self,
                  num_background_agents: int,
@@ -23,7 +23,8 @@ class SimulatorSampledArrival:
                  eta: float = 0.2,
                  hbl_agent: bool = False,
                  lam_r: float = None,
-                 market_observers: Optional[Sequence[object]] = None
+                 market_observers: Optional[Sequence[object]] = None,
+                 seed: Optional[int] = None
                  ):
 
         if shade is None:
@@ -39,10 +40,16 @@ class SimulatorSampledArrival:
         self.time = 0
         self.hbl_agent = hbl_agent
 
+        # Without an explicit seed the generator is seeded from the global NumPy state so
+        # np.random.seed() keeps runs reproducible.
+        if seed is None:
+            seed = np.random.randint(0, 2**32, dtype=np.uint64)
+        self._rng = np.random.default_rng(seed)
+
         self.arrivals = defaultdict(list)
         self.arrivals_sampled = 10000
-        self.initial_arrivals = sample_arrivals(lam, self.num_agents)
-        self.arrival_times = sample_arrivals(lam_r, self.arrivals_sampled)
+        self.initial_arrivals = sample_arrivals(lam, self.num_agents, self._rng)
+        self.arrival_times = sample_arrivals(lam_r, self.arrivals_sampled, self._rng)
         self.arrival_index = 0
 
         self.markets = []
@@ -109,7 +116,7 @@ class SimulatorSampledArrival:
                     orders = agent.take_action()
                     market.add_orders(orders)
                     if self.arrival_index == self.arrivals_sampled:
-                        self.arrival_times = sample_arrivals(self.lam_r, self.arrivals_sampled)
+                        self.arrival_times = sample_arrivals(self.lam_r, self.arrivals_sampled, self._rng)
                         self.arrival_index = 0
                     self.arrivals[self.arrival_times[self.arrival_index].item() + 1 + self.time].append(agent_id)
                     self.arrival_index += 1
@@ -130,12 +137,11 @@ class SimulatorSampledArrival:
         else:
             self.end_sim()
 
+    def final_values(self) -> np.ndarray:
+        return final_values(self.agents, self.markets)
+
     def end_sim(self):
-        fundamental_val = self.markets[0].get_final_fundamental()
-        values = {}
-        for agent_id in self.agents:
-            agent = self.agents[agent_id]
-            values[agent_id] = agent.get_pos_value() + agent.position*fundamental_val + agent.cash
+        values = dict(zip(self.agents, self.final_values().tolist()))
         # print(f'At the end of the simulation we get {values}')
         return values
 
@@ -143,11 +149,14 @@ class SimulatorSampledArrival:
         counter = 0
         for t in range(self.sim_time):
             if self.arrivals[t]:
+                begin_observer_batches(self._market_observers)
                 try:
                     self.step()
                 except KeyError:
                     print(self.arrivals[self.time])
                     return self.markets
+                finally:
+                    end_observer_batches(self._market_observers)
                 counter += 1
             self.time += 1
         self.step()
@@ -158,6 +167,13 @@ class SimulatorSampledArrival:
         self._market_observers[market_index] = observer
 
 
-def sample_arrivals(p, num_samples):
-    geometric_dist = dist.Geometric(torch.tensor([p]))
-    return geometric_dist.sample((num_samples,)).squeeze()  # Returns a tensor of 1000 sampled time steps
+def sample_arrivals(p, num_samples, rng=None):
+    """
+    Draw ``num_samples`` inter-arrival gaps in one vectorized call.
+
+    Gaps count the failures before the first success of a Bernoulli(p) trial per time step, matching
+    ``torch.distributions.Geometric``; NumPy counts trials, hence the ``- 1``.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    return rng.geometric(p, size=num_samples) - 1
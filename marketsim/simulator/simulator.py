@@ -1,5 +1,7 @@
 import random
-from typing import List, Optional, Sequence
+from typing import List, Mapping, Optional, Sequence
+
+import numpy as np
 
 
 from ..market.market import Market
@@ -8,6 +10,31 @@ from ..fundamental.lazy_mean_reverting import LazyGaussianMeanReverting
 from ..agent.zero_intelligence_agent import ZIAgent
 
 
+def final_values(agents: Mapping[int, object], markets: Sequence[Market]) -> np.ndarray:
+    """Final value of every agent in ``agents`` order.
+
+    That is the private value of its position plus its holdings at the final fundamental of
+    ``markets[0]``. Agent state is gathered in one pass and rolled up as a single array expression.
+    """
+    fundamental_val = markets[0].get_final_fundamental()
+    state = np.array([(agent.position, agent.cash, float(agent.get_pos_value())) for agent in agents.values()],
+                     dtype=np.float64).reshape(-1, 3)
+    return state[:, 2] + state[:, 0] * fundamental_val + state[:, 1]
+
+
+def begin_observer_batches(observers: Sequence[Optional[object]]) -> None:
+    """Open a dispatch batch on every market observer that supports batching."""
+    for observer in observers:
+        if observer is not None and hasattr(observer, "begin_batch"):
+            observer.begin_batch()
+
+
+def end_observer_batches(observers: Sequence[Optional[object]]) -> None:
+    """Flush the batch opened by :func:`begin_observer_batches`."""
+    for observer in observers:
+        if observer is not None and hasattr(observer, "end_batch"):
+            observer.end_batch()
+
 
 class Simulator:
     def __init__(self,
@@ -87,14 +114,18 @@ class Simulator:
             raise IndexError("market_index out of range")
         self._market_observers[market_index] = observer
 
+    def final_values(self) -> np.ndarray:
+        return final_values(self.agents, self.markets)
+
     def end_sim(self):
-        fundamental_val = self.markets[0].get_final_fundamental()
-        values = {}
-        for agent_id in self.agents:
-            agent = self.agents[agent_id]
-            values[agent_id] = agent.get_pos_value() + agent.position * fundamental_val + agent.cash
+        values = dict(zip(self.agents, self.final_values().tolist()))
         # print(f'At the end of the simulation we get {values}')
+        return values
 
     def run(self):
         for t in range(self.sim_time + 1):
-            self.step()
+            begin_observer_batches(self._market_observers)
+            try:
+                self.step()
+            finally:
+                end_observer_batches(self._market_observers)
@@ -1,4 +1,10 @@
-from marketsim import Config, Experiment
+import copy
+import pickle
+
+import numpy as np
+
+from marketsim import Config, Experiment, ExperimentBatch
+from marketsim.experiment import Exchange, TopOfBookEvent, TradeEvent
 
 
 def test_experiment_emits_top_of_book_events():
@@ -25,3 +31,137 @@ def test_experiment_emits_top_of_book_events():
         assert event.time >= 0
         assert event.bid_size >= 0
         assert event.ask_size >= 0
+
+
+def test_experiment_batch_runs_seed_sweep():
+    cfg = Config.single_market_default(
+        n_steps=30,
+        background_agents=5,
+        arrival_rate=0.5,
+    )
+    batch = ExperimentBatch.from_seeds(cfg, [1, 2, 1])
+    assert [config.seed for config in batch.configs] == [1, 2, 1]
+    assert batch.configs[0].simulator_kwargs is not batch.configs[1].simulator_kwargs
+
+    result = batch.run()
+
+    assert len(result) == 3
+    assert np.all(result.steps == 30)
+    assert result.trades[0] == result.trades[2]
+    assert result.final_fundamental[0] == result.final_fundamental[2]
+    assert result.final_fundamental[0] != result.final_fundamental[1]
+
+
+def test_experiment_batch_seeds_override_config_seed():
+    cfg = Config.single_market_default(
+        n_steps=30,
+        seed=3,
+        background_agents=5,
+        arrival_rate=0.5,
+    )
+    batch = ExperimentBatch.from_seeds(cfg, [1, 2, 3])
+
+    arrivals = [Experiment(config).simulator.arrival_times.tolist() for config in batch.configs]
+
+    assert arrivals[0] != arrivals[1]
+    assert arrivals[1] != arrivals[2]
+    assert arrivals[2] == Experiment(cfg).simulator.arrival_times.tolist()
+
+
+def test_exchange_flushes_trades_in_batches():
+    cfg = Config.single_market_default(
+        n_steps=50,
+        seed=7,
+        background_agents=5,
+        arrival_rate=0.5,
+    )
+    exp = Experiment(cfg)
+
+    batches = []
+    trades = []
+    exp.exchange.on_trades_batch(batches.append)
+    exp.exchange.on_trade(trades.append)
+
+    result = exp.run()
+
+    assert all(batch for batch in batches)
+    assert sum(len(batch) for batch in batches) == result.trades
+    assert [event for batch in batches for event in batch] == trades
+
+
+def test_experiment_builds_one_exchange_per_market():
+    single = Experiment(Config.single_market_default(n_steps=10, seed=5, background_agents=2))
+    cfg = Config.single_market_default(n_steps=10, seed=5, background_agents=2)
+    cfg.simulator_kwargs["num_assets"] = 2
+    multi = Experiment(cfg)
+
+    assert type(single) is Experiment
+    assert single._exchanges == [single.exchange]
+    assert single.exchange.name == "market-0"
+    assert single.exchange._market is single.simulator.markets[0]
+    assert copy.copy(single).exchange is single.exchange
+    assert pickle.loads(pickle.dumps(single)).exchange.name == "market-0"
+
+    replacement = Exchange(name="replacement")
+    single.exchange = replacement
+    assert single._exchanges == [replacement]
+
+    assert len(multi.simulator.markets) == 2
+    assert multi.exchange.name == "market-0"
+    assert [exchange._market for exchange in multi._exchanges] == multi.simulator.markets
+
+
+def test_exchange_records_top_of_book_columns():
+    cfg = Config.single_market_default(
+        n_steps=50,
+        seed=11,
+        background_agents=5,
+        arrival_rate=0.5,
+    )
+    exp = Experiment(cfg)
+
+    streamed = []
+    deferred = []
+    exp.exchange.on_top_of_book(streamed.append)
+    exp.exchange.on_top_of_book(deferred.append, stream=False)
+
+    exp.run()
+    frame = exp.exchange.top_of_book_frame()
+    run_events = list(streamed)
+
+    assert run_events and deferred == []
+    joined = []
+    exp.exchange.on_top_of_book(joined.append, stream=False)
+    assert deferred == []
+    exp.exchange.handle_top_of_book(exp.simulator.markets[0])
+    exp.exchange.flush_top_of_book()
+    assert deferred == streamed
+    assert joined == streamed[-1:]
+    exp.exchange.flush_top_of_book()
+    assert deferred == streamed
+
+    recorded = Experiment(cfg)
+    recorded.exchange.record_top_of_book()
+    recorded.run()
+    late = []
+    recorded.exchange.on_top_of_book(late.append, stream=False)
+    recorded.exchange.flush_top_of_book()
+    assert len(recorded.exchange.top_of_book_frame()["time"]) == len(run_events)
+    assert late == []
+
+    assert len(frame["time"]) == len(run_events)
+    assert frame["time"].tolist() == [event.time for event in run_events]
+    assert frame["bid_size"].tolist() == [event.bid_size for event in run_events]
+    bids = [np.nan if event.best_bid is None else event.best_bid for event in run_events]
+    np.testing.assert_array_equal(frame["best_bid"], np.array(bids))
+
+
+def test_events_survive_pickle_and_copy():
+    events = [
+        TradeEvent(price=100.5, qty=2.0, side="BUY", time=3, agent_id=7),
+        TopOfBookEvent(best_bid=None, bid_size=0.0, best_ask=101.0, ask_size=1.0, time=3),
+    ]
+    for event in events:
+        for clone in (pickle.loads(pickle.dumps(event)), copy.copy(event), copy.deepcopy(event)):
+            assert clone == event
+            assert type(clone) is type(event)
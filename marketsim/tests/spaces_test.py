@@ -0,0 +1,32 @@
+import numpy as np
+
+from gymnasium.spaces import Box
+
+
+def test_box_sample_bounds_and_dtype():
+    box = Box(low=np.array([0.0, -1.0]), high=np.array([1.0, 0.0]), shape=(2,), dtype=np.float32, seed=0)
+    samples = np.stack([box.sample() for _ in range(500)])
+
+    assert samples.dtype == np.float32
+    assert samples.shape == (500, 2)
+    assert np.all(samples >= box.low) and np.all(samples <= box.high)
+
+
+def test_box_seed_is_reproducible():
+    first = Box(low=-1.0, high=1.0, shape=(3,), seed=42)
+    second = Box(low=-1.0, high=1.0, shape=(3,), seed=42)
+    draws = [first.sample() for _ in range(3)]
+    np.testing.assert_array_equal(np.stack(draws), np.stack([second.sample() for _ in range(3)]))
+
+    assert first.seed(42) == [42]
+    np.testing.assert_array_equal(np.stack([first.sample() for _ in range(3)]), np.stack(draws))
+
+
+def test_unseeded_box_follows_global_numpy_seed():
+    box = Box(low=-1.0, high=1.0, shape=(3,))
+    other = Box(low=-1.0, high=1.0, shape=(3,))
+
+    np.random.seed(7)
+    draws = [box.sample() for _ in range(3)]
+    np.random.seed(7)
+    np.testing.assert_array_equal(np.stack([other.sample() for _ in range(3)]), np.stack(draws))
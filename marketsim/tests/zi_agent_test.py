@@ -1,3 +1,5 @@
+import pytest
+
 from marketsim.simulator.sampled_arrival_simulator import SimulatorSampledArrival
 
 
@@ -20,3 +22,26 @@ def test_sampled_arrival_simulator_runs():
         value = agent.get_pos_value() + agent.position * fundamental_val + agent.cash
         values.append(value)
     assert len(values) == len(sim.agents)
+
+
+def test_final_values_match_agent_rollup():
+    sim = SimulatorSampledArrival(
+        num_background_agents=5,
+        sim_time=25,
+        lam=0.5,
+        mean=1000,
+        r=0.05,
+        shock_var=50,
+        q_max=5,
+        pv_var=1e4,
+        shade=[20, 40],
+        seed=0,
+    )
+    sim.run()
+    fundamental_val = sim.markets[0].get_final_fundamental()
+    expected = [
+        float(agent.get_pos_value()) + agent.position * fundamental_val + agent.cash
+        for agent in sim.agents.values()
+    ]
+    assert sim.final_values() == pytest.approx(expected)
+    assert list(sim.end_sim()) == list(sim.agents)